@@ -1,20 +1,36 @@
 """Middleware for CORS and rate limiting"""
 
-from fastapi import Request, Response
+import time
+import uuid
+
 from fastapi.middleware.cors import CORSMiddleware
 from slowapi import Limiter
 from slowapi.util import get_remote_address
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from ..core.config import get_settings
 from ..core.exceptions import RateLimitError
+from ..core.logging import get_logger
 
 settings = get_settings()
+logger = get_logger(__name__)
+
+# Per-client limit string, built once and shared by the limiter and route decorators
+RATE_LIMIT = f"{settings.rate_limit_per_minute}/minute"
 
-# Rate limiter instance
+# Rate limiter instance shared by all routes. With Redis storage the moving-window
+# check runs as a single atomic Lua script, so limits hold across workers and pods.
+# If Redis becomes unreachable, limits fall back to per-process memory rather than
+# failing requests.
 limiter = Limiter(
     key_func=get_remote_address,
-    default_limits=[f"{settings.rate_limit_per_minute}/minute"],
+    default_limits=[RATE_LIMIT],
+    storage_uri=settings.redis_url or "memory://",
+    strategy="moving-window",
+    headers_enabled=True,
+    in_memory_fallback_enabled=True,
+    swallow_errors=True,
     enabled=settings.rate_limit_enabled,
 )
 
@@ -26,51 +42,68 @@ def configure_cors(app) -> None:
         allow_origins=settings.cors_origins,
         allow_credentials=True,
         allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-        allow_headers=["*"],
-        expose_headers=["Content-Disposition"],
+        allow_headers=["Accept", "Accept-Language", "Content-Language", "Content-Type"],
+        expose_headers=[
+            "Content-Disposition",
+            "X-RateLimit-Limit",
+            "X-RateLimit-Remaining",
+            "X-RateLimit-Reset",
+        ],
+        max_age=settings.cors_preflight_max_age_seconds,
     )
 
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
+class RequestLoggingMiddleware:
     """Log incoming requests with timing information"""
 
-    async def dispatch(self, request: Request, call_next):
-        import time
-        import uuid
-        from ..core.logging import get_logger
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
 
-        logger = get_logger(__name__)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
         # Generate request ID
-        request_id = str(uuid.uuid4())
-        request.state.request_id = request_id
+        request_id = uuid.uuid4().hex
+        scope.setdefault("state", {})["request_id"] = request_id
+
+        method = scope["method"]
+        path = scope["path"]
+        client = scope.get("client")
+        ip_address = client[0] if client else "unknown"
 
         # Log request start
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         logger.info(
-            f"Request started: {request.method} {request.url.path}",
+            f"Request started: {method} {path}",
             extra={
                 "request_id": request_id,
-                "ip_address": request.client.host if request.client else "unknown",
+                "ip_address": ip_address,
             },
         )
 
+        status_code = 500
+
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Add request ID to response headers
+                MutableHeaders(scope=message).append("X-Request-ID", request_id)
+            await send(message)
+
         # Process request
-        response: Response = await call_next(request)
+        await self.app(scope, receive, send_with_request_id)
 
         # Log request completion
-        duration_ms = int((time.time() - start_time) * 1000)
+        duration_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
         logger.info(
-            f"Request completed: {request.method} {request.url.path}",
+            f"Request completed: {method} {path}",
             extra={
                 "request_id": request_id,
-                "ip_address": request.client.host if request.client else "unknown",
+                "ip_address": ip_address,
                 "duration_ms": duration_ms,
-                "status_code": response.status_code,
+                "status_code": status_code,
             },
         )
-
-        # Add request ID to response headers
-        response.headers["X-Request-ID"] = request_id
-
-        return response
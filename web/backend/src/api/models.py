@@ -5,7 +5,7 @@ from enum import Enum
 from typing import Any
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class ErrorResponse(BaseModel):
@@ -67,6 +67,8 @@ class WatermarkSize(str, Enum):
 # Data Models (User Story 1)
 class UploadSession(BaseModel):
     """Upload session tracking"""
+    model_config = ConfigDict(extra="ignore", validate_assignment=False)
+
     session_id: UUID = Field(..., description="Unique session identifier")
     client_ip: str = Field(..., description="Anonymized client IP address")
     uploaded_at: datetime = Field(default_factory=datetime.utcnow, description="Upload timestamp")
@@ -74,6 +76,8 @@ class UploadSession(BaseModel):
 
 class ProcessingJob(BaseModel):
     """Watermark removal processing job"""
+    model_config = ConfigDict(extra="ignore", validate_assignment=False)
+
     job_id: UUID = Field(..., description="Unique job identifier")
     session_id: UUID = Field(..., description="Parent session identifier")
     input_file_path: str = Field(..., description="Input file path")
@@ -91,6 +95,8 @@ class ProcessingJob(BaseModel):
 
 class ImageMetadata(BaseModel):
     """Image metadata from validation"""
+    model_config = ConfigDict(extra="ignore", validate_assignment=False)
+
     job_id: UUID = Field(..., description="Associated job identifier")
     file_name: str = Field(..., description="Original filename")
     file_size_bytes: int = Field(..., description="File size in bytes")
@@ -107,17 +113,10 @@ class ImageMetadata(BaseModel):
 # API Response Models (User Story 1)
 class SingleImageResponse(BaseModel):
     """Response for single image processing"""
-    job_id: str = Field(..., description="Job identifier for tracking")
-    status: JobStatus = Field(..., description="Processing status")
-    processed_image_base64: str | None = Field(None, description="Base64-encoded processed image")
-    original_filename: str = Field(..., description="Original uploaded filename")
-    output_filename: str | None = Field(None, description="Generated output filename")
-    duration_ms: int | None = Field(None, description="Processing duration")
-    watermark_size: WatermarkSize = Field(..., description="Detected watermark size")
-    error: str | None = Field(None, description="Error message if processing failed")
-
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        extra="ignore",
+        validate_assignment=False,
+        json_schema_extra={
             "example": {
                 "job_id": "a1b2c3d4-e5f6-7890-abcd-ef1234567890",
                 "status": "completed",
@@ -128,4 +127,14 @@ class SingleImageResponse(BaseModel):
                 "watermark_size": "large_96x96",
                 "error": None,
             }
-        }
+        },
+    )
+
+    job_id: str = Field(..., description="Job identifier for tracking")
+    status: JobStatus = Field(..., description="Processing status")
+    processed_image_base64: str | None = Field(None, description="Base64-encoded processed image")
+    original_filename: str = Field(..., description="Original uploaded filename")
+    output_filename: str | None = Field(None, description="Generated output filename")
+    duration_ms: int | None = Field(None, description="Processing duration")
+    watermark_size: WatermarkSize = Field(..., description="Detected watermark size")
+    error: str | None = Field(None, description="Error message if processing failed")
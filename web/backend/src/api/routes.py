@@ -1,27 +1,49 @@
 """Health check and API routes"""
 
 import os
+import time
 import uuid
 from datetime import datetime
+from functools import lru_cache
+from typing import Literal
 
-from fastapi import APIRouter, BackgroundTasks, File, Form, Request, UploadFile, status
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+import orjson
+from fastapi import APIRouter, BackgroundTasks, File, Form, Request, Response, UploadFile, status
+from fastapi.responses import FileResponse
 
 from .. import __version__
 from ..api.models import SingleImageResponse, UploadSession
 from ..core.config import get_settings
-from ..core.exceptions import ValidationError
+from ..core.exceptions import ProcessingError, ValidationError
+from ..core.logging import anonymize_ip, get_logger
 from ..services.file_service import FileService
-from ..services.watermark_service import watermark_service
+from ..services.watermark_service import get_watermark_service
+from .middleware import RATE_LIMIT, limiter
 from .models import HealthResponse, ReadinessResponse
 
 settings = get_settings()
+logger = get_logger(__name__)
 router = APIRouter()
-limiter = Limiter(key_func=get_remote_address)
 
-# Initialize services
-file_service = FileService()
+# Readiness probes run every few seconds; filesystem checks are reused for this long
+READINESS_CACHE_TTL_SECONDS = 5.0
+_path_check_cache: dict[tuple[str, int, bool], tuple[bool, float]] = {}
+
+# Probe bodies that never change, serialized once at import
+HEALTH_JSON = orjson.dumps({"status": "healthy", "version": __version__})
+READY_JSON = orjson.dumps(
+    {
+        "ready": True,
+        "checks": {"binary": True, "upload_dir": True, "output_dir": True},
+        "message": "All systems operational",
+    }
+)
+
+
+@lru_cache
+def get_file_service() -> FileService:
+    """Get the file service, creating it on first use"""
+    return FileService()
 
 
 @router.get(
@@ -31,12 +53,9 @@ file_service = FileService()
     summary="Health check endpoint",
     description="Returns basic health status of the service",
 )
-async def health_check() -> HealthResponse:
+async def health_check() -> Response:
     """Basic health check - always returns 200 if service is running"""
-    return HealthResponse(
-        status="healthy",
-        version=__version__,
-    )
+    return Response(content=HEALTH_JSON, media_type="application/json")
 
 
 @router.get(
@@ -46,41 +65,36 @@ async def health_check() -> HealthResponse:
     summary="Readiness check endpoint",
     description="Verifies all dependencies are available (binary, storage, etc.)",
 )
-async def readiness_check() -> ReadinessResponse:
+async def readiness_check() -> Response | ReadinessResponse:
     """Readiness check - verifies all dependencies are available"""
     checks = {}
     all_ready = True
 
     # Check if binary exists and is executable
-    binary_exists = os.path.isfile(settings.binary_path) and os.access(
-        settings.binary_path, os.X_OK
-    )
+    binary_exists = _check_path(settings.binary_path, os.X_OK)
     checks["binary"] = binary_exists
     if not binary_exists:
         all_ready = False
 
     # Check if upload directory is writable
-    upload_dir_writable = os.path.isdir(settings.upload_dir) and os.access(
-        settings.upload_dir, os.W_OK
-    )
+    upload_dir_writable = _check_path(settings.upload_dir, os.W_OK, is_dir=True)
     checks["upload_dir"] = upload_dir_writable
     if not upload_dir_writable:
         all_ready = False
 
     # Check if output directory is writable
-    output_dir_writable = os.path.isdir(settings.output_dir) and os.access(
-        settings.output_dir, os.W_OK
-    )
+    output_dir_writable = _check_path(settings.output_dir, os.W_OK, is_dir=True)
     checks["output_dir"] = output_dir_writable
     if not output_dir_writable:
         all_ready = False
 
-    message = "All systems operational" if all_ready else "Some dependencies unavailable"
+    if all_ready:
+        return Response(content=READY_JSON, media_type="application/json")
 
     return ReadinessResponse(
         ready=all_ready,
         checks=checks,
-        message=message,
+        message="Some dependencies unavailable",
     )
 
 
@@ -91,26 +105,34 @@ async def readiness_check() -> ReadinessResponse:
     summary="Remove watermark from a single image",
     description="Upload an image with Gemini watermark and receive the cleaned result",
     responses={
-        200: {"description": "Image processed successfully"},
+        200: {
+            "description": "Image processed successfully",
+            "content": {"image/*": {}},
+        },
         400: {"description": "Invalid request or file validation failed"},
         429: {"description": "Rate limit exceeded"},
         500: {"description": "Internal processing error"},
         504: {"description": "Processing timeout"},
     },
 )
-@limiter.limit(f"{settings.rate_limit_per_minute}/minute")
+@limiter.limit(RATE_LIMIT)
 async def remove_watermark(
     request: Request,
+    response: Response,
     background_tasks: BackgroundTasks,
     file: UploadFile = File(..., description="Image file to process"),
-) -> SingleImageResponse:
+    response_format: Literal["json", "binary"] = Form(
+        "json", description="Return a JSON envelope with base64 image, or the raw image bytes"
+    ),
+) -> SingleImageResponse | FileResponse:
     """
     Remove Gemini watermark from uploaded image
 
     **Workflow**:
     1. Validate file (format, size, content)
     2. Process image through GeminiWatermarkTool binary
-    3. Return base64-encoded processed image
+    3. Return base64-encoded processed image, or the raw image when
+       `response_format=binary`
     4. Clean up files in background
 
     **Supported Formats**: JPG, PNG, WebP, BMP
@@ -122,37 +144,46 @@ async def remove_watermark(
 
     # Step 2: Get client IP (anonymized)
     client_ip = request.client.host if request.client else "unknown"
-    anonymized_ip = _anonymize_ip(client_ip)
+    anonymized_ip = anonymize_ip(client_ip)
 
-    # Step 3: Create upload session
-    session = UploadSession(
+    # Step 3: Create upload session (server-authored, so skip validation)
+    session = UploadSession.model_construct(
         session_id=uuid.uuid4(),
         client_ip=anonymized_ip,
         uploaded_at=datetime.utcnow(),
     )
 
-    # Step 5: Read file content
-    file_content = await file.read()
-
-    # Step 6: Validate file size
-    if len(file_content) > settings.max_file_size_mb * 1024 * 1024:
-        raise ValidationError(
-            f"File size exceeds {settings.max_file_size_mb}MB limit",
-            details={
-                "max_size_mb": settings.max_file_size_mb,
-                "received_size_mb": round(len(file_content) / (1024 * 1024), 2),
-            },
-        )
+    # Step 4: Reject bad names and known oversizes before any bytes hit the disk
+    watermark_service = get_watermark_service()
+    watermark_service.file_validator.validate_metadata_only(file.filename, file.size or 0)
 
-    # Step 7: Process image
-    response = await watermark_service.process_single_image(
-        file_content, file.filename, session
+    # Step 5: Stream file to disk, rejecting oversized uploads mid-stream
+    upload = await get_file_service().save_upload(file, file.filename)
+
+    # Step 6: Process image
+    result = await watermark_service.process_single_image(
+        upload["path"],
+        upload["size_bytes"],
+        file.filename,
+        session,
+        include_base64=response_format == "json",
     )
 
-    # Step 8: Schedule cleanup in background
-    background_tasks.add_task(_cleanup_files, response.output_filename)
+    # Step 7: Schedule cleanup in background (runs after the response is sent)
+    background_tasks.add_task(_cleanup_files, result.output_filename)
+
+    if response_format == "binary":
+        if result.output_filename is None:
+            raise ProcessingError(
+                "Processed image is unavailable",
+                details={"job_id": result.job_id},
+            )
+        return FileResponse(
+            path=get_file_service().get_output_path(result.output_filename),
+            filename=result.output_filename,
+        )
 
-    return response
+    return result
 
 
 async def _cleanup_files(output_filename: str | None) -> None:
@@ -164,27 +195,31 @@ async def _cleanup_files(output_filename: str | None) -> None:
     """
     if output_filename:
         try:
-            await file_service.delete_file(output_filename, from_output=True)
+            await get_file_service().delete_file(output_filename, from_output=True)
         except Exception as e:
             # Log but don't fail - cleanup is best effort
-            from ..core.logging import get_logger
-            logger = get_logger(__name__)
             logger.warning(f"Failed to cleanup file {output_filename}: {e}")
 
 
-def _anonymize_ip(ip: str) -> str:
+def _check_path(path: str, mode: int, is_dir: bool = False) -> bool:
     """
-    Anonymize IP address by zeroing last octet (IPv4) or last groups (IPv6)
+    Check a path exists and is accessible, caching the result for a short TTL
 
     Args:
-        ip: IP address string
+        path: File or directory path
+        mode: Access mode passed to os.access (e.g. os.X_OK, os.W_OK)
+        is_dir: If True, require a directory; otherwise a regular file
 
     Returns:
-        Anonymized IP address
+        True if the path exists with the requested access
     """
-    if ":" in ip:  # IPv6
-        parts = ip.split(":")
-        return ":".join(parts[:4]) + ":0:0:0:0"
-    else:  # IPv4
-        parts = ip.split(".")
-        return ".".join(parts[:3]) + ".0"
+    key = (path, mode, is_dir)
+    now = time.monotonic()
+    cached = _path_check_cache.get(key)
+    if cached is not None and cached[1] > now:
+        return cached[0]
+
+    exists = os.path.isdir(path) if is_dir else os.path.isfile(path)
+    result = exists and os.access(path, mode)
+    _path_check_cache[key] = (result, now + READINESS_CACHE_TTL_SECONDS)
+    return result
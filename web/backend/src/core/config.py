@@ -1,10 +1,11 @@
 """Application configuration management"""
 
 import os
+from dataclasses import dataclass, fields
 from functools import lru_cache
 from typing import Any, Literal
 
-from pydantic import model_validator
+from pydantic import computed_field, model_validator
 from pydantic_settings import BaseSettings
 
 
@@ -20,10 +21,14 @@ class Settings(BaseSettings):
     
     # CORS origins - can be comma-separated string or list
     cors_origins: list[str] | str = ["http://localhost:3000", "http://localhost:8000"]
+    # How long browsers may cache CORS preflight responses
+    cors_preflight_max_age_seconds: int = 86400
     
     # Rate limiting
     rate_limit_per_minute: int = 10
     rate_limit_enabled: bool = True
+    # Shared limiter storage (e.g. redis://redis:6379/0); in-process memory if unset
+    redis_url: str | None = None
     
     # File processing
     max_file_size_mb: int = 10
@@ -64,14 +69,56 @@ class Settings(BaseSettings):
                 ]
         
         return data
+
+    @computed_field  # type: ignore[misc]
+    @property
+    def max_file_size_bytes(self) -> int:
+        """Maximum upload size in bytes"""
+        return self.max_file_size_mb * 1024 * 1024
+
+    @computed_field  # type: ignore[misc]
+    @property
+    def ephemeral_retention_seconds(self) -> int:
+        """Retention period for ephemeral files in seconds"""
+        return self.ephemeral_retention_hours * 3600
     
     class Config:
         env_file = ".env"
         case_sensitive = False
 
 
+@dataclass(frozen=True, slots=True)
+class RuntimeSettings:
+    """Immutable snapshot of validated settings read on the request path"""
+
+    app_env: str
+    host: str
+    port: int
+    cors_origins: list[str]
+    cors_preflight_max_age_seconds: int
+    rate_limit_per_minute: int
+    rate_limit_enabled: bool
+    redis_url: str | None
+    max_file_size_mb: int
+    max_file_size_bytes: int
+    allowed_extensions: list[str]
+    ephemeral_retention_hours: int
+    ephemeral_retention_seconds: int
+    binary_path: str
+    binary_timeout_seconds: int
+    upload_dir: str
+    output_dir: str
+    log_level: str
+    log_format: str
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "RuntimeSettings":
+        """Build a snapshot from validated Settings"""
+        return cls(**{field.name: getattr(settings, field.name) for field in fields(cls)})
+
+
 @lru_cache
-def get_settings() -> Settings:
+def get_settings() -> RuntimeSettings:
     """Get cached application settings"""
-    return Settings()
+    return RuntimeSettings.from_settings(Settings())
 
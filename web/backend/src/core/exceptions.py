@@ -1,9 +1,18 @@
 """Custom exception classes for the application"""
 
+from typing import Any
+
 
 class AppException(Exception):
     """Base exception for all application errors"""
 
+    # Error type reported to clients, fixed per class when the class is created
+    error_name: str = "AppException"
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls.error_name = cls.__name__
+
     def __init__(self, message: str, status_code: int = 500, details: dict | None = None):
         self.message = message
         self.status_code = status_code
@@ -1,20 +1,61 @@
 """Structured logging configuration"""
 
-import json
+import ipaddress
 import logging
 import sys
-from datetime import datetime
+import time
+from functools import lru_cache
 from typing import Any
 
+import orjson
+
 from .config import get_settings
 
 
+# Keep the /24 network of IPv4 addresses and the /64 network of IPv6 addresses
+_IPV4_NETWORK_MASK = 0xFFFFFF00
+_IPV6_NETWORK_MASK = (1 << 128) - (1 << 64)
+
+
+@lru_cache(maxsize=4096)
+def anonymize_ip(ip: str) -> str:
+    """
+    Anonymize IP address by zeroing the host part (last octet for IPv4, last 64 bits for IPv6)
+
+    Args:
+        ip: IP address string
+
+    Returns:
+        Anonymized IP address, or the input unchanged if it is not a valid IP
+    """
+    try:
+        addr = ipaddress.ip_address(ip)
+    except ValueError:
+        return ip
+
+    if addr.version == 4:
+        return str(ipaddress.IPv4Address(int(addr) & _IPV4_NETWORK_MASK))
+    return str(ipaddress.IPv6Address(int(addr) & _IPV6_NETWORK_MASK))
+
+
+@lru_cache(maxsize=4)
+def _format_utc_second(second: int) -> str:
+    """Format the whole-second part of a timestamp, reused by every record in that second"""
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+
+
+def _format_timestamp(created: float) -> str:
+    """Format a LogRecord creation time as ISO 8601 UTC with microseconds"""
+    second = int(created)
+    return f"{_format_utc_second(second)}.{int((created - second) * 1_000_000):06d}Z"
+
+
 class JSONFormatter(logging.Formatter):
     """Format logs as JSON with structured fields"""
 
     def format(self, record: logging.LogRecord) -> str:
         log_data: dict[str, Any] = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": _format_timestamp(record.created),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -28,20 +69,13 @@ class JSONFormatter(logging.Formatter):
         if hasattr(record, "request_id"):
             log_data["request_id"] = record.request_id
         if hasattr(record, "ip_address"):
-            # Anonymize IP: keep first 3 octets for IPv4, first 4 groups for IPv6
-            ip = record.ip_address
-            if ":" in ip:  # IPv6
-                parts = ip.split(":")
-                log_data["ip_address"] = ":".join(parts[:4]) + ":xxxx:xxxx:xxxx:xxxx"
-            else:  # IPv4
-                parts = ip.split(".")
-                log_data["ip_address"] = ".".join(parts[:3]) + ".xxx"
+            log_data["ip_address"] = anonymize_ip(record.ip_address)
         if hasattr(record, "duration_ms"):
             log_data["duration_ms"] = record.duration_ms
         if hasattr(record, "status_code"):
             log_data["status_code"] = record.status_code
 
-        return json.dumps(log_data)
+        return orjson.dumps(log_data).decode()
 
 
 def setup_logging() -> None:
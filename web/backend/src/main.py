@@ -2,8 +2,9 @@
 
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, Request, status
-from fastapi.responses import JSONResponse
+import orjson
+from fastapi import FastAPI, Request, Response, status
+from fastapi.responses import ORJSONResponse
 from slowapi.errors import RateLimitExceeded
 
 from . import __version__
@@ -12,14 +13,31 @@ from .api.routes import router
 from .core.config import get_settings
 from .core.exceptions import AppException
 from .core.logging import get_logger, setup_logging
+from .services.file_service import shutdown_io_pool
 
 settings = get_settings()
+logger = get_logger(__name__)
+
+# Error bodies that never change, serialized once so error floods stay cheap
+RATE_LIMIT_ERROR_JSON = orjson.dumps(
+    {
+        "error": "RateLimitExceeded",
+        "message": "Too many requests. Please try again later.",
+        "details": {"limit": f"{settings.rate_limit_per_minute} requests per minute"},
+    }
+)
+INTERNAL_ERROR_JSON = orjson.dumps(
+    {
+        "error": "InternalServerError",
+        "message": "An unexpected error occurred",
+        "details": {},
+    }
+)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events"""
-    logger = get_logger(__name__)
     logger.info("Application startup", extra={"version": __version__, "env": settings.app_env})
 
     # Create storage directories if they don't exist
@@ -30,6 +48,7 @@ async def lifespan(app: FastAPI):
 
     yield
 
+    shutdown_io_pool()
     logger.info("Application shutdown")
 
 
@@ -42,6 +61,7 @@ app = FastAPI(
     description="Web API for removing Gemini watermarks from images",
     version=__version__,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS
@@ -56,19 +76,18 @@ app.state.limiter = limiter
 @app.exception_handler(AppException)
 async def app_exception_handler(request: Request, exc: AppException):
     """Handle application exceptions"""
-    logger = get_logger(__name__)
     logger.warning(
         f"Application exception: {exc.message}",
         extra={
-            "error": exc.__class__.__name__,
+            "error": exc.error_name,
             "status_code": exc.status_code,
             "details": exc.details,
         },
     )
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
-            "error": exc.__class__.__name__,
+            "error": exc.error_name,
             "message": exc.message,
             "details": exc.details,
         },
@@ -78,27 +97,24 @@ async def app_exception_handler(request: Request, exc: AppException):
 @app.exception_handler(RateLimitExceeded)
 async def rate_limit_handler(request: Request, exc: RateLimitExceeded):
     """Handle rate limit exceptions"""
-    logger = get_logger(__name__)
     logger.warning(
         "Rate limit exceeded",
         extra={
             "ip_address": request.client.host if request.client else "unknown",
         },
     )
-    return JSONResponse(
+    response = Response(
+        content=RATE_LIMIT_ERROR_JSON,
         status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-        content={
-            "error": "RateLimitExceeded",
-            "message": "Too many requests. Please try again later.",
-            "details": {"limit": f"{settings.rate_limit_per_minute} requests per minute"},
-        },
+        media_type="application/json",
     )
+    # Clients need Retry-After and X-RateLimit-* most on the rejected request
+    return request.app.state.limiter._inject_headers(response, request.state.view_rate_limit)
 
 
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
     """Handle unexpected exceptions"""
-    logger = get_logger(__name__)
     logger.error(
         f"Unexpected exception: {str(exc)}",
         exc_info=True,
@@ -106,13 +122,10 @@ async def general_exception_handler(request: Request, exc: Exception):
             "error": exc.__class__.__name__,
         },
     )
-    return JSONResponse(
+    return Response(
+        content=INTERNAL_ERROR_JSON,
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        content={
-            "error": "InternalServerError",
-            "message": "An unexpected error occurred",
-            "details": {},
-        },
+        media_type="application/json",
     )
 
 
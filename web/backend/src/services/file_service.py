@@ -1,18 +1,59 @@
 """File service for managing ephemeral uploads and outputs"""
 
 import asyncio
+import errno
 import os
+import time
 import uuid
-from datetime import datetime, timedelta
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Any
+
+import aiofiles
+import aiofiles.os
+from fastapi import UploadFile
 
 from ..core.config import get_settings
-from ..core.exceptions import FileNotFoundError
+from ..core.exceptions import FileNotFoundError, ValidationError
 from ..core.logging import get_logger
 
 settings = get_settings()
 logger = get_logger(__name__)
 
+# Uploads are copied to disk in chunks of this size so memory stays flat per request
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Maximum number of unlink calls in flight during a cleanup sweep
+CLEANUP_UNLINK_CONCURRENCY = 32
+
+# Threads reserved for blocking filesystem calls, kept apart from the default
+# executor that runs CPU-bound image work
+FS_IO_WORKERS = 16
+
+_io_pool: ThreadPoolExecutor | None = None
+
+
+def get_io_pool() -> ThreadPoolExecutor:
+    """
+    Get the shared disk I/O thread pool, creating it on first use
+
+    Callers resolve the pool at each use rather than holding on to it, since
+    shutdown_io_pool() discards it at the end of every application lifespan.
+    """
+    global _io_pool
+    if _io_pool is None:
+        _io_pool = ThreadPoolExecutor(max_workers=FS_IO_WORKERS, thread_name_prefix="fs-io")
+    return _io_pool
+
+
+def shutdown_io_pool() -> None:
+    """Shut down the disk I/O thread pool if it was created"""
+    global _io_pool
+    if _io_pool is not None:
+        _io_pool.shutdown(wait=False)
+        _io_pool = None
+
 
 class FileService:
     """Manage ephemeral file storage"""
@@ -20,8 +61,18 @@ class FileService:
     def __init__(self):
         self.upload_dir = Path(settings.upload_dir)
         self.output_dir = Path(settings.output_dir)
+        self._output_dir_str = str(self.output_dir)
         self.retention_hours = settings.ephemeral_retention_hours
 
+        # Modification times seen by the last cleanup sweep, keyed by full path, so
+        # repeated sweeps only stat() new entries. Only the sweep fills this, and it
+        # rebuilds it from the directory listing, so it never outgrows the directories.
+        self._known_mtimes: dict[str, float] = {}
+
+        # Cleanup sweeps run at most once per 1/60th of the retention period
+        self.cleanup_interval_seconds = settings.ephemeral_retention_seconds / 60
+        self._last_cleanup_ts: float | None = None
+
         # Ensure directories exist
         self.upload_dir.mkdir(parents=True, exist_ok=True)
         self.output_dir.mkdir(parents=True, exist_ok=True)
@@ -37,44 +88,62 @@ class FileService:
             Tuple of (unique_filename, file_extension)
         """
         file_uuid = str(uuid.uuid4())
-        extension = Path(original_filename).suffix
+        extension = os.path.splitext(original_filename)[1]
         unique_filename = f"{file_uuid}{extension}"
 
         return unique_filename, extension
 
-    async def save_upload(self, file_content: bytes, filename: str) -> dict[str, str]:
+    async def save_upload(self, upload: UploadFile, filename: str) -> dict[str, Any]:
         """
-        Save uploaded file to ephemeral storage
+        Stream an uploaded file to ephemeral storage without buffering it in memory
 
         Args:
-            file_content: File content as bytes
+            upload: Uploaded file from the multipart request
             filename: Original filename
 
         Returns:
-            Dictionary with file paths and identifiers
+            Dictionary with file paths, identifiers and size
+
+        Raises:
+            ValidationError: If the upload exceeds the maximum file size
         """
         unique_filename, extension = self.generate_filename(filename)
         file_path = self.upload_dir / unique_filename
-
-        # Write file asynchronously
-        loop = asyncio.get_event_loop()
-        await loop.run_in_executor(None, file_path.write_bytes, file_content)
+        size_bytes = 0
+
+        try:
+            async with aiofiles.open(file_path, "wb", executor=get_io_pool()) as f:
+                while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+                    size_bytes += len(chunk)
+                    if size_bytes > settings.max_file_size_bytes:
+                        raise ValidationError(
+                            f"File size exceeds {settings.max_file_size_mb}MB limit",
+                            details={
+                                "max_size_mb": settings.max_file_size_mb,
+                                "received_size_mb": round(size_bytes / (1024 * 1024), 2),
+                            },
+                        )
+                    await f.write(chunk)
+        except BaseException:
+            # Don't leave partial uploads behind
+            await self.delete_file(unique_filename)
+            raise
 
         logger.info(
             "File uploaded",
             extra={
                 "original_filename": filename,
                 "unique_filename": unique_filename,
-                "size_bytes": len(file_content),
+                "size_bytes": size_bytes,
             },
         )
 
         return {
-            "file_id": str(uuid.uuid4())[:8],  # Short ID for tracking
+            "file_id": unique_filename[:8],  # Short ID for tracking
             "filename": unique_filename,
             "path": str(file_path),
             "original_filename": filename,
-            "size_bytes": len(file_content),
+            "size_bytes": size_bytes,
         }
 
     def get_output_path(self, input_filename: str) -> str:
@@ -88,8 +157,7 @@ class FileService:
             Full path to output file
         """
         # Keep same filename, different directory
-        output_path = self.output_dir / input_filename
-        return str(output_path)
+        return os.path.join(self._output_dir_str, input_filename)
 
     async def get_file(self, filename: str, from_output: bool = False) -> bytes:
         """
@@ -114,8 +182,8 @@ class FileService:
                 details={"file_name": filename, "directory": str(directory)},
             )
 
-        loop = asyncio.get_event_loop()
-        content = await loop.run_in_executor(None, file_path.read_bytes)
+        async with aiofiles.open(file_path, "rb", executor=get_io_pool()) as f:
+            content = await f.read()
 
         return content
 
@@ -131,8 +199,8 @@ class FileService:
         file_path = directory / filename
 
         if file_path.exists():
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(None, file_path.unlink)
+            await aiofiles.os.remove(file_path, executor=get_io_pool())
+            self._known_mtimes.pop(str(file_path), None)
             logger.info(f"File deleted: {filename}")
 
     async def cleanup_old_files(self) -> dict[str, int]:
@@ -142,8 +210,21 @@ class FileService:
         Returns:
             Dictionary with cleanup statistics
         """
-        cutoff_time = datetime.now() - timedelta(hours=self.retention_hours)
-        deleted_count = {"uploads": 0, "outputs": 0}
+        deleted_count = Counter({"uploads": 0, "outputs": 0})
+
+        # Throttle sweeps; nothing can have expired much since the last one
+        now = time.monotonic()
+        if (
+            self._last_cleanup_ts is not None
+            and now - self._last_cleanup_ts < self.cleanup_interval_seconds
+        ):
+            return deleted_count
+        self._last_cleanup_ts = now
+
+        cutoff_time = time.time() - settings.ephemeral_retention_seconds
+        loop = asyncio.get_running_loop()
+        known_mtimes: dict[str, float] = {}
+        expired_files: list[tuple[str, str]] = []
 
         for directory_name, directory_path in [
             ("uploads", self.upload_dir),
@@ -152,20 +233,39 @@ class FileService:
             if not directory_path.exists():
                 continue
 
-            for file_path in directory_path.iterdir():
-                if not file_path.is_file():
-                    continue
+            # Single directory scan; is_file() uses the file type from the listing
+            with os.scandir(directory_path) as entries:
+                for entry in entries:
+                    if not entry.is_file(follow_symlinks=False):
+                        continue
+
+                    # Check file modification time
+                    mtime = self._get_mtime(entry)
+                    if mtime < cutoff_time:
+                        expired_files.append((directory_name, entry.path))
+                    else:
+                        known_mtimes[entry.path] = mtime
+
+        # Fan unlinks out to the I/O pool so the filesystem can overlap them
+        semaphore = asyncio.Semaphore(CLEANUP_UNLINK_CONCURRENCY)
 
-                # Check file modification time
-                file_mtime = datetime.fromtimestamp(file_path.stat().st_mtime)
+        async def delete_expired(directory_name: str, path: str) -> None:
+            name = os.path.basename(path)
+            async with semaphore:
+                try:
+                    deleted = await loop.run_in_executor(get_io_pool(), _unlink_if_exists, path)
+                except Exception as e:
+                    logger.warning(f"Failed to delete file {name}: {e}")
+                    return
 
-                if file_mtime < cutoff_time:
-                    try:
-                        file_path.unlink()
-                        deleted_count[directory_name] += 1
-                        logger.debug(f"Cleaned up old file: {file_path.name}")
-                    except Exception as e:
-                        logger.warning(f"Failed to delete file {file_path.name}: {e}")
+            if deleted:
+                deleted_count[directory_name] += 1
+                logger.debug("Cleaned up old file: %s", name)
+
+        await asyncio.gather(*(delete_expired(name, path) for name, path in expired_files))
+
+        # Keep only files still present; files saved meanwhile are re-stat'ed next scan
+        self._known_mtimes = known_mtimes
 
         logger.info(
             "File cleanup completed",
@@ -178,14 +278,14 @@ class FileService:
 
         return deleted_count
 
-    def get_storage_stats(self) -> dict[str, any]:
+    def get_storage_stats(self) -> dict[str, Any]:
         """
         Get storage statistics
 
         Returns:
             Dictionary with storage information
         """
-        stats = {
+        stats: dict[str, Any] = {
             "upload_dir": str(self.upload_dir),
             "output_dir": str(self.output_dir),
             "upload_count": 0,
@@ -203,10 +303,12 @@ class FileService:
             count = 0
             total_size = 0
 
-            for file_path in directory_path.iterdir():
-                if file_path.is_file():
-                    count += 1
-                    total_size += file_path.stat().st_size
+            with os.scandir(directory_path) as entries:
+                for entry in entries:
+                    if entry.is_file(follow_symlinks=False):
+                        # Always stat; sizes of files still being written change
+                        count += 1
+                        total_size += entry.stat(follow_symlinks=False).st_size
 
             stats[directory_name] = count
             stats["total_size_bytes"] += total_size
@@ -214,3 +316,38 @@ class FileService:
         stats["total_size_mb"] = round(stats["total_size_bytes"] / (1024 * 1024), 2)
 
         return stats
+
+    def _get_mtime(self, entry: os.DirEntry) -> float:
+        """
+        Get the modification time of a directory entry, consulting the sweep cache first
+
+        Args:
+            entry: Directory entry from os.scandir
+
+        Returns:
+            Modification time as a Unix timestamp
+        """
+        mtime = self._known_mtimes.get(entry.path)
+        if mtime is None:
+            mtime = entry.stat(follow_symlinks=False).st_mtime
+        return mtime
+
+
+def _unlink_if_exists(path: str) -> bool:
+    """
+    Delete a file, tolerating it having already been removed
+
+    Args:
+        path: Path of the file to delete
+
+    Returns:
+        True if the file was deleted, False if it no longer existed
+    """
+    try:
+        os.unlink(path)
+    except OSError as e:
+        if e.errno != errno.ENOENT:
+            raise
+        return False
+
+    return True
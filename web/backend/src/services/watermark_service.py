@@ -1,9 +1,12 @@
 """Watermark removal orchestration service"""
 
+import asyncio
 import base64
+import os
+import time
 import uuid
 from datetime import datetime
-from pathlib import Path
+from functools import lru_cache
 
 from ..api.models import (
     ImageFormat,
@@ -33,17 +36,23 @@ class WatermarkService:
 
     async def process_single_image(
         self,
-        file_content: bytes,
+        input_path: str,
+        file_size: int,
         filename: str,
         session: UploadSession,
+        include_base64: bool = True,
     ) -> SingleImageResponse:
         """
         Process a single image through the watermark removal workflow
 
         Args:
-            file_content: Image file bytes
+            input_path: Path to the uploaded image in ephemeral storage; its name,
+                extension and size must already have passed validate_metadata_only
+            file_size: Uploaded file size in bytes
             filename: Original filename
             session: Upload session context
+            include_base64: If False, leave the processed image on disk and omit it from
+                the response
 
         Returns:
             SingleImageResponse with processed image
@@ -62,28 +71,25 @@ class WatermarkService:
             },
         )
 
-        # Step 1: Save uploaded file
-        upload_result = await self.file_service.save_upload(file_content, filename)
-        input_path = upload_result["path"]
-
-        # Step 2: Validate file
-        validation_result = self.file_validator.validate_file(
-            input_path, len(file_content), filename
+        # Step 1: Parse the image header off the event loop
+        loop = asyncio.get_running_loop()
+        image_info = await loop.run_in_executor(
+            None, self.file_validator.validate_image_format, input_path
         )
+        validation_result = {"size_bytes": file_size, "metadata": image_info}
 
-        # Step 3: Extract image metadata
+        # Step 2: Extract image metadata
         metadata = self._create_image_metadata(
             job_id, filename, validation_result
         )
 
-        # Step 4: Determine watermark size
-        watermark_size = self._detect_watermark_size(
-            metadata.width_pixels, metadata.height_pixels
-        )
+        # Step 3: Determine watermark size
+        watermark_size = metadata.watermark_size
 
-        # Step 5: Create processing job
-        output_path = self.file_service.get_output_path(upload_result["filename"])
-        job = ProcessingJob(
+        # Step 4: Create processing job
+        output_filename = os.path.basename(input_path)
+        output_path = self.file_service.get_output_path(output_filename)
+        job = ProcessingJob.model_construct(
             job_id=job_id,
             session_id=session.session_id,
             input_file_path=input_path,
@@ -94,21 +100,26 @@ class WatermarkService:
         )
 
         try:
-            # Step 6: Execute binary
-            start_time = datetime.utcnow()
+            # Step 5: Execute binary
+            start_ns = time.monotonic_ns()
             result = await self.binary_executor.execute(input_path, output_path)
 
-            # Step 7: Update job status
+            # Step 6: Update job status
             job.status = JobStatus.COMPLETED
             job.completed_at = datetime.utcnow()
-            job.duration_ms = int((job.completed_at - start_time).total_seconds() * 1000)
+            job.duration_ms = (time.monotonic_ns() - start_ns) // 1_000_000
             job.binary_exit_code = result["exit_code"]
 
-            # Step 8: Read processed image and encode to base64
-            processed_content = await self.file_service.get_file(
-                Path(output_path).name, from_output=True
-            )
-            processed_base64 = base64.b64encode(processed_content).decode("utf-8")
+            # Step 7: Read processed image and encode to base64
+            processed_base64 = None
+            if include_base64:
+                processed_content = await self.file_service.get_file(
+                    output_filename, from_output=True
+                )
+                # Encoding multi-MB images is CPU-bound; keep it off the event loop
+                processed_base64 = await loop.run_in_executor(
+                    None, _encode_base64, processed_content
+                )
 
             logger.info(
                 "Image processing completed",
@@ -119,13 +130,13 @@ class WatermarkService:
                 },
             )
 
-            # Step 9: Return response
-            return SingleImageResponse(
+            # Step 8: Return response
+            return SingleImageResponse.model_construct(
                 job_id=str(job_id),
                 status=job.status,
                 processed_image_base64=processed_base64,
                 original_filename=filename,
-                output_filename=Path(output_path).name,
+                output_filename=output_filename,
                 duration_ms=job.duration_ms,
                 watermark_size=watermark_size,
                 error=None,
@@ -172,7 +183,7 @@ class WatermarkService:
             metadata_dict["width"], metadata_dict["height"]
         )
 
-        return ImageMetadata(
+        return ImageMetadata.model_construct(
             job_id=job_id,
             file_name=filename,
             file_size_bytes=validation_result["size_bytes"],
@@ -203,5 +214,12 @@ class WatermarkService:
             return WatermarkSize.LARGE_96X96
 
 
-# Singleton instance
-watermark_service = WatermarkService()
+def _encode_base64(data: bytes) -> str:
+    """Base64-encode bytes to an ASCII string"""
+    return base64.b64encode(data).decode("ascii")
+
+
+@lru_cache
+def get_watermark_service() -> WatermarkService:
+    """Get the shared watermark service, creating it on first use"""
+    return WatermarkService()
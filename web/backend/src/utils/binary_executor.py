@@ -1,8 +1,10 @@
 """Binary execution utility for running GeminiWatermarkTool"""
 
 import asyncio
+import logging
 import subprocess
 from pathlib import Path
+from typing import Any
 
 from ..core.config import get_settings
 from ..core.exceptions import BinaryExecutionError
@@ -11,6 +13,9 @@ from ..core.logging import get_logger
 settings = get_settings()
 logger = get_logger(__name__)
 
+# Trailing bytes of stderr kept for logs and error details; the error is usually last
+STDERR_MAX_BYTES = 4096
+
 
 class BinaryExecutor:
     """Wrapper for executing the GeminiWatermarkTool binary"""
@@ -19,9 +24,12 @@ class BinaryExecutor:
         self.binary_path = binary_path or settings.binary_path
         self.timeout = timeout or settings.binary_timeout_seconds
 
+        # Binary location is fixed at runtime; only stat() it until it's been found once
+        self._binary_verified = False
+
     async def execute(
         self, input_path: str, output_path: str, additional_args: list[str] | None = None
-    ) -> dict[str, any]:
+    ) -> dict[str, Any]:
         """
         Execute the watermark removal binary
 
@@ -31,17 +39,20 @@ class BinaryExecutor:
             additional_args: Optional additional command-line arguments
 
         Returns:
-            Dictionary with execution results (exit_code, stdout, stderr, success)
+            Dictionary with execution results (exit_code, stdout, stderr, success);
+            stdout is only captured when DEBUG logging is enabled
 
         Raises:
             BinaryExecutionError: If binary execution fails
         """
         # Verify binary exists
-        if not Path(self.binary_path).is_file():
-            raise BinaryExecutionError(
-                f"Binary not found at {self.binary_path}",
-                details={"binary_path": self.binary_path},
-            )
+        if not self._binary_verified:
+            if not Path(self.binary_path).is_file():
+                raise BinaryExecutionError(
+                    f"Binary not found at {self.binary_path}",
+                    details={"binary_path": self.binary_path},
+                )
+            self._binary_verified = True
 
         # Build command with proper flags
         cmd = [
@@ -53,16 +64,20 @@ class BinaryExecutor:
         if additional_args:
             cmd.extend(additional_args)
 
-        logger.info(
-            "Executing binary",
-            extra={"command": " ".join(cmd), "timeout": self.timeout},
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Executing binary",
+                extra={"command": " ".join(cmd), "timeout": self.timeout},
+            )
+
+        # stdout is only worth capturing when it will be logged
+        capture_stdout = logger.isEnabledFor(logging.DEBUG)
 
         try:
             # Execute command with timeout
             process = await asyncio.create_subprocess_exec(
                 *cmd,
-                stdout=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE if capture_stdout else asyncio.subprocess.DEVNULL,
                 stderr=asyncio.subprocess.PIPE,
             )
 
@@ -79,8 +94,8 @@ class BinaryExecutor:
                 )
 
             exit_code = process.returncode
-            stdout_text = stdout.decode("utf-8", errors="replace")
-            stderr_text = stderr.decode("utf-8", errors="replace")
+            stdout_text = stdout.decode("utf-8", errors="replace") if stdout else ""
+            stderr_text = stderr[-STDERR_MAX_BYTES:].decode("utf-8", errors="replace")
 
             result = {
                 "exit_code": exit_code,
@@ -107,9 +122,19 @@ class BinaryExecutor:
                 "Binary execution successful",
                 extra={"exit_code": exit_code},
             )
+            if capture_stdout:
+                logger.debug("Binary output", extra={"stdout": stdout_text})
 
             return result
 
+        except FileNotFoundError:
+            # Binary disappeared since it was verified; re-check on the next call
+            self._binary_verified = False
+            raise BinaryExecutionError(
+                f"Binary not found at {self.binary_path}",
+                details={"binary_path": self.binary_path},
+            )
+
         except subprocess.SubprocessError as e:
             raise BinaryExecutionError(
                 f"Failed to execute binary: {str(e)}",
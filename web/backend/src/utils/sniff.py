@@ -0,0 +1,288 @@
+"""Image header sniffing for the accepted upload formats
+
+The sniffers only answer for headers they can fully verify: every segment or
+chunk Pillow reads while opening the file is checked, and anything unfamiliar
+returns None so the caller falls back to Pillow.
+"""
+
+import struct
+import zlib
+
+# Bytes to read from the start of a file; enough to get past typical JPEG APPn segments
+SNIFF_HEADER_BYTES = 64 * 1024
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# (bit depth, color type) pairs Pillow can open
+_PNG_MODES = frozenset(
+    [(depth, 0) for depth in (1, 2, 4, 8, 16)]
+    + [(depth, 3) for depth in (1, 2, 4, 8)]
+    + [(depth, color_type) for depth in (8, 16) for color_type in (2, 4, 6)]
+)
+
+# JPEG start-of-frame markers carry the image dimensions (C4, C8 and CC are not SOFs)
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+# JPEG table markers allowed between SOI and SOS (DQT, DHT, DRI)
+_JPEG_DQT_MARKER = 0xDB
+_JPEG_DHT_MARKER = 0xC4
+_JPEG_DRI_MARKER = 0xDD
+
+# JPEG APPn and COM segments, which carry metadata only
+_JPEG_METADATA_MARKERS = frozenset(range(0xE0, 0xF0)) | {0xFE}
+
+# JPEG start-of-scan; Pillow stops parsing headers here
+_JPEG_SOS_MARKER = 0xDA
+
+# Extended WebP flag for animated files, which are left to Pillow
+_WEBP_ANIMATION_FLAG = 0x02
+
+# DIB header sizes Pillow understands (OS/2 v1, Windows v3, v3 + masks, OS/2 v2, v4, v5)
+_BMP_HEADER_SIZES = frozenset({12, 40, 52, 56, 64, 108, 124})
+
+# Bits per pixel Pillow reads without compression
+_BMP_BIT_DEPTHS = frozenset({1, 2, 4, 8, 16, 24, 32})
+
+
+def sniff(data: bytes, file_size: int | None = None) -> tuple[str, int, int] | None:
+    """
+    Identify an image and its dimensions from its leading bytes
+
+    Args:
+        data: Leading bytes of the file (SNIFF_HEADER_BYTES is enough in practice)
+        file_size: Total file size in bytes; defaults to len(data), i.e. data is
+            the whole file
+
+    Returns:
+        Tuple of (format, width, height) using Pillow's format names, or None if the
+        format is not recognized, the header is malformed or truncated, or more
+        than data is needed to be sure
+    """
+    if file_size is None:
+        file_size = len(data)
+
+    try:
+        if data.startswith(_PNG_SIGNATURE):
+            result = _sniff_png(data)
+        elif data.startswith(b"\xff\xd8\xff"):
+            result = _sniff_jpeg(data)
+        elif data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+            result = _sniff_webp(data, file_size)
+        elif data.startswith(b"BM"):
+            result = _sniff_bmp(data)
+        else:
+            return None
+    except (struct.error, IndexError):
+        return None
+
+    if result is None or result[1] <= 0 or result[2] <= 0:
+        return None
+    return result
+
+
+def _sniff_png(data: bytes) -> tuple[str, int, int] | None:
+    """Read dimensions from IHDR after checking every chunk up to the first IDAT"""
+    width = height = color_type = 0
+    seen_palette = False
+    offset = 8
+    while True:
+        length, chunk_type = struct.unpack_from(">I4s", data, offset)
+        if not chunk_type.isalpha():
+            return None
+
+        if chunk_type == b"IDAT":
+            if offset == 8 or (color_type == 3 and not seen_palette):
+                return None
+            return "PNG", width, height
+
+        # Pillow verifies the CRC of every chunk it reads while opening
+        payload = data[offset + 8 : offset + 8 + length]
+        (crc,) = struct.unpack_from(">I", data, offset + 8 + length)
+        if len(payload) != length or zlib.crc32(chunk_type + payload) != crc:
+            return None
+
+        if offset == 8:
+            if chunk_type != b"IHDR" or length != 13:
+                return None
+            width, height, bit_depth, color_type, compression, filter_method, interlace = (
+                struct.unpack(">IIBBBBB", payload)
+            )
+            if (bit_depth, color_type) not in _PNG_MODES:
+                return None
+            if compression != 0 or filter_method != 0 or interlace not in (0, 1):
+                return None
+        elif chunk_type == b"PLTE":
+            if seen_palette or length == 0 or length % 3 or length > 3 * 256:
+                return None
+            seen_palette = True
+        elif chunk_type in (b"IHDR", b"IEND"):
+            return None
+
+        offset += 12 + length
+
+
+def _sniff_jpeg(data: bytes) -> tuple[str, int, int] | None:
+    """Walk the table and metadata segments after SOI through one SOF up to the first SOS"""
+    size = None
+    offset = 2
+    while True:
+        if data[offset] != 0xFF:
+            return None
+        marker = data[offset + 1]
+        (segment_length,) = struct.unpack_from(">H", data, offset + 2)
+        segment = data[offset + 4 : offset + 2 + segment_length]
+        if segment_length < 2 or len(segment) != segment_length - 2:
+            return None
+
+        if marker == _JPEG_SOS_MARKER:
+            return ("JPEG", size[0], size[1]) if size is not None else None
+
+        if marker in _JPEG_SOF_MARKERS:
+            if size is not None:
+                return None
+            precision, height, width, components = struct.unpack_from(">BHHB", segment)
+            # Pillow only handles 8-bit L, RGB and CMYK frames
+            if precision != 8 or components not in (1, 3, 4):
+                return None
+            if len(segment) != 6 + 3 * components:
+                return None
+            size = (width, height)
+        elif marker == _JPEG_DQT_MARKER:
+            if not _valid_jpeg_dqt(segment):
+                return None
+        elif marker == _JPEG_DHT_MARKER:
+            if not _valid_jpeg_dht(segment):
+                return None
+        elif marker == _JPEG_DRI_MARKER:
+            if len(segment) != 2:
+                return None
+        elif marker in _JPEG_METADATA_MARKERS:
+            # Pillow unpacks the fixed fields of JFIF and Adobe segments while opening
+            if marker == 0xE0 and segment[:4] == b"JFIF" and len(segment) < 12:
+                return None
+            if marker == 0xEE and segment[:5] == b"Adobe" and len(segment) < 7:
+                return None
+        else:
+            return None
+
+        offset += 2 + segment_length
+
+
+def _valid_jpeg_dqt(segment: bytes) -> bool:
+    """Check a DQT segment is a whole number of 8- or 16-bit tables"""
+    offset = 0
+    while offset < len(segment):
+        precision, table_id = divmod(segment[offset], 16)
+        if precision > 1 or table_id > 3:
+            return False
+        offset += 1 + 64 * (precision + 1)
+    return offset == len(segment) and offset > 0
+
+
+def _valid_jpeg_dht(segment: bytes) -> bool:
+    """Check a DHT segment's code counts match its symbol tables"""
+    offset = 0
+    while offset < len(segment):
+        table_class, table_id = divmod(segment[offset], 16)
+        if table_class > 1 or table_id > 3:
+            return False
+        counts = segment[offset + 1 : offset + 17]
+        if len(counts) != 16:
+            return False
+        offset += 17 + sum(counts)
+    return offset == len(segment) and offset > 0
+
+
+def _sniff_webp(data: bytes, file_size: int) -> tuple[str, int, int] | None:
+    """Read dimensions from a still lossy, lossless or extended WebP after checking its chunks"""
+    # libwebp rejects files shorter than the RIFF container claims
+    (riff_size,) = struct.unpack_from("<I", data, 4)
+    riff_end = 8 + riff_size
+    if riff_size < 12 or riff_end > file_size:
+        return None
+
+    chunk, chunk_size = struct.unpack_from("<4sI", data, 12)
+    if 20 + chunk_size > riff_end:
+        return None
+
+    if chunk != b"VP8X":
+        return _sniff_webp_frame(data, 12, riff_end)
+
+    if chunk_size != 10 or data[20] & _WEBP_ANIMATION_FLAG:
+        return None
+    canvas_width = int.from_bytes(data[24:27], "little") + 1
+    canvas_height = int.from_bytes(data[27:30], "little") + 1
+
+    # Skip ICCP/ALPH/metadata chunks up to the image; a still frame must fill the canvas
+    offset = 30
+    while True:
+        chunk, chunk_size = struct.unpack_from("<4sI", data, offset)
+        if chunk in (b"VP8 ", b"VP8L"):
+            result = _sniff_webp_frame(data, offset, riff_end)
+            if result is None or result[1:] != (canvas_width, canvas_height):
+                return None
+            return result
+        if chunk in (b"VP8X", b"ANIM", b"ANMF"):
+            return None
+        offset += 8 + chunk_size + (chunk_size & 1)
+        if offset > riff_end:
+            return None
+
+
+def _sniff_webp_frame(data: bytes, offset: int, riff_end: int) -> tuple[str, int, int] | None:
+    """Validate a VP8 or VP8L chunk header the way libwebp does before decoding"""
+    chunk, chunk_size = struct.unpack_from("<4sI", data, offset)
+    if offset + 8 + chunk_size > riff_end:
+        return None
+    payload = offset + 8
+
+    if chunk == b"VP8 ":
+        if chunk_size < 10:
+            return None
+        frame_tag = int.from_bytes(data[payload : payload + 3], "little")
+        key_frame = not frame_tag & 1
+        version = (frame_tag >> 1) & 7
+        show_frame = (frame_tag >> 4) & 1
+        partition_size = frame_tag >> 5
+        if not key_frame or version > 3 or not show_frame or partition_size >= chunk_size:
+            return None
+        if data[payload + 3 : payload + 6] != b"\x9d\x01\x2a":
+            return None
+        width, height = struct.unpack_from("<HH", data, payload + 6)
+        return "WEBP", width & 0x3FFF, height & 0x3FFF
+
+    if chunk == b"VP8L":
+        if chunk_size < 5 or data[payload] != 0x2F:
+            return None
+        (bits,) = struct.unpack_from("<I", data, payload + 1)
+        # Top three bits are the version, which must be zero
+        if bits >> 29:
+            return None
+        return "WEBP", (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+
+    return None
+
+
+def _sniff_bmp(data: bytes) -> tuple[str, int, int] | None:
+    """Read dimensions from an uncompressed DIB header that follows the file header"""
+    (header_size,) = struct.unpack_from("<I", data, 14)
+    if header_size not in _BMP_HEADER_SIZES:
+        return None
+
+    if header_size == 12:  # BITMAPCOREHEADER
+        width, height, planes, bits = struct.unpack_from("<HHHH", data, 18)
+        compression = 0
+        colors_used = 0
+    else:  # BITMAPINFOHEADER and later; negative height is top-down
+        width, height, planes, bits, compression, _, _, _, colors_used = struct.unpack_from(
+            "<iiHHIIiiI", data, 18
+        )
+        height = abs(height)
+
+    # RLE and bitfield layouts have their own validation in Pillow; leave those to it
+    if planes != 1 or bits not in _BMP_BIT_DEPTHS or compression != 0:
+        return None
+    if bits <= 8 and colors_used > 1 << bits:
+        return None
+
+    return "BMP", width, height
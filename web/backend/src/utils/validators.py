@@ -1,25 +1,42 @@
 """File validation utilities"""
 
-import mimetypes
+import os
 from pathlib import Path
+from typing import Any
 
 from PIL import Image
 
 from ..core.config import get_settings
 from ..core.exceptions import ValidationError
 from ..core.logging import get_logger
+from .sniff import SNIFF_HEADER_BYTES, sniff
 
 settings = get_settings()
 logger = get_logger(__name__)
 
+# Pillow decoders probed when the header can't be sniffed directly
+PIL_FORMATS = ("JPEG", "PNG", "WEBP", "BMP")
+
+# MIME types of the image extensions we can accept
+_EXT_MIME = {
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+    ".webp": "image/webp",
+    ".bmp": "image/bmp",
+}
+
 
 class FileValidator:
     """Validate uploaded files"""
 
     def __init__(self):
-        self.max_size_bytes = settings.max_file_size_mb * 1024 * 1024
+        self.max_size_bytes = settings.max_file_size_bytes
         self.allowed_extensions = settings.allowed_extensions
 
+        # Load Pillow's format plugins now rather than on the first upload
+        Image.init()
+
     def validate_file_size(self, file_size: int) -> None:
         """
         Validate file size is within limits
@@ -67,17 +84,17 @@ class FileValidator:
             file_path: Path to the file
 
         Raises:
-            ValidationError: If MIME type is not an image
+            ValidationError: If the extension doesn't map to an image MIME type
         """
-        mime_type, _ = mimetypes.guess_type(file_path)
+        extension = Path(file_path).suffix.lower()
 
-        if not mime_type or not mime_type.startswith("image/"):
+        if extension not in _EXT_MIME:
             raise ValidationError(
                 "File is not a valid image",
-                details={"mime_type": mime_type or "unknown"},
+                details={"extension": extension},
             )
 
-    def validate_image_format(self, file_path: str) -> dict[str, any]:
+    def validate_image_format(self, file_path: str) -> dict[str, Any]:
         """
         Validate file is a valid image and extract metadata
 
@@ -85,26 +102,38 @@ class FileValidator:
             file_path: Path to the image file
 
         Returns:
-            Dictionary with image metadata (format, width, height, mode)
+            Dictionary with image metadata (format, width, height, mode); mode is
+            None when the header was sniffed without Pillow
 
         Raises:
             ValidationError: If file is not a valid image
         """
         try:
-            with Image.open(file_path) as img:
-                metadata = {
-                    "format": img.format,
-                    "width": img.width,
-                    "height": img.height,
-                    "mode": img.mode,
-                }
+            # Parse the header directly for the accepted formats; Pillow handles the rest
+            with open(file_path, "rb") as f:
+                sniffed = sniff(f.read(SNIFF_HEADER_BYTES), os.fstat(f.fileno()).st_size)
 
-                logger.info(
-                    "Image validated",
-                    extra={"metadata": metadata},
-                )
+            # Huge dimensions go through Pillow so its decompression-bomb check applies
+            max_pixels = Image.MAX_IMAGE_PIXELS
+            if sniffed is not None and max_pixels and sniffed[1] * sniffed[2] > max_pixels:
+                sniffed = None
 
-                return metadata
+            if sniffed is not None:
+                image_format, width, height = sniffed
+                metadata = {
+                    "format": image_format,
+                    "width": width,
+                    "height": height,
+                    "mode": None,
+                }
+            else:
+                with Image.open(file_path, formats=PIL_FORMATS) as img:
+                    metadata = {
+                        "format": img.format,
+                        "width": img.width,
+                        "height": img.height,
+                        "mode": img.mode,
+                    }
 
         except Exception as e:
             raise ValidationError(
@@ -112,7 +141,29 @@ class FileValidator:
                 details={"error": str(e)},
             )
 
-    def validate_file(self, file_path: str, file_size: int, filename: str) -> dict[str, any]:
+        logger.info(
+            "Image validated",
+            extra={"metadata": metadata},
+        )
+
+        return metadata
+
+    def validate_metadata_only(self, filename: str, file_size: int) -> None:
+        """
+        Validate everything that can be checked without reading the file
+
+        Args:
+            filename: Original filename
+            file_size: File size in bytes
+
+        Raises:
+            ValidationError: If size, extension or MIME type is not allowed
+        """
+        self.validate_file_size(file_size)
+        self.validate_file_extension(filename)
+        self.validate_mime_type(filename)
+
+    def validate_file(self, file_path: str, file_size: int, filename: str) -> dict[str, Any]:
         """
         Perform comprehensive file validation
 
@@ -127,14 +178,8 @@ class FileValidator:
         Raises:
             ValidationError: If any validation fails
         """
-        # Validate size
-        self.validate_file_size(file_size)
-
-        # Validate extension
-        self.validate_file_extension(filename)
-
-        # Validate MIME type
-        self.validate_mime_type(file_path)
+        # Validate size, extension and MIME type
+        self.validate_metadata_only(filename, file_size)
 
         # Validate image format and get metadata
         metadata = self.validate_image_format(file_path)
@@ -0,0 +1,19 @@
+"""Tests for application configuration"""
+
+from dataclasses import fields
+
+from src.core.config import RuntimeSettings, Settings, get_settings
+
+
+def test_runtime_settings_mirror_settings_fields():
+    expected = set(Settings.model_fields) | set(Settings.model_computed_fields)
+
+    assert {field.name for field in fields(RuntimeSettings)} == expected
+
+
+def test_get_settings_snapshots_validated_values():
+    validated = Settings()
+    snapshot = get_settings()
+
+    for name in set(Settings.model_fields) | set(Settings.model_computed_fields):
+        assert getattr(snapshot, name) == getattr(validated, name)
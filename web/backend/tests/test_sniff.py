@@ -0,0 +1,293 @@
+"""Tests for image header sniffing"""
+
+import struct
+import zlib
+
+import pytest
+
+from src.utils.sniff import sniff
+
+
+def _png_chunk(chunk_type: bytes, payload: bytes) -> bytes:
+    crc = zlib.crc32(chunk_type + payload)
+    return struct.pack(">I", len(payload)) + chunk_type + payload + struct.pack(">I", crc)
+
+
+def _png(
+    width: int,
+    height: int,
+    bit_depth: int = 8,
+    color_type: int = 2,
+    palette: bytes = bytes(3 * 16),
+) -> bytes:
+    ihdr = struct.pack(">IIBBBBB", width, height, bit_depth, color_type, 0, 0, 0)
+    plte = _png_chunk(b"PLTE", palette) if color_type == 3 else b""
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + _png_chunk(b"IHDR", ihdr)
+        + plte
+        + _png_chunk(b"tEXt", b"Comment\x00test")
+        + _png_chunk(b"IDAT", zlib.compress(b"\x00" * 16))
+        + _png_chunk(b"IEND", b"")
+    )
+
+
+def _jpeg_segment(marker: int, payload: bytes) -> bytes:
+    return bytes([0xFF, marker]) + struct.pack(">H", len(payload) + 2) + payload
+
+
+def _jpeg(
+    width: int,
+    height: int,
+    sof_marker: int = 0xC0,
+    precision: int = 8,
+    components: int = 3,
+    with_sos: bool = True,
+) -> bytes:
+    app0 = _jpeg_segment(0xE0, b"JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00")
+    dqt = _jpeg_segment(0xDB, b"\x00" + bytes(64))
+    sof = _jpeg_segment(
+        sof_marker,
+        struct.pack(">BHHB", precision, height, width, components)
+        + b"".join(bytes([i + 1, 0x11, 0]) for i in range(components)),
+    )
+    data = b"\xff\xd8" + app0 + dqt + sof
+    if with_sos:
+        data += _jpeg_segment(0xDA, b"\x01\x01\x00\x00\x3f\x00") + b"\x00" * 16 + b"\xff\xd9"
+    return data
+
+
+def _webp(*chunks: bytes) -> bytes:
+    body = b"".join(chunks)
+    return b"RIFF" + struct.pack("<I", len(body) + 4) + b"WEBP" + body
+
+
+def _webp_chunk(chunk_type: bytes, payload: bytes) -> bytes:
+    padding = b"\x00" if len(payload) % 2 else b""
+    return chunk_type + struct.pack("<I", len(payload)) + payload + padding
+
+
+def _vp8(width: int, height: int, frame_tag: int | None = None) -> bytes:
+    if frame_tag is None:
+        frame_tag = (1 << 4) | (4 << 5)  # key frame, version 0, shown, 4-byte partition
+    frame = frame_tag.to_bytes(3, "little") + b"\x9d\x01\x2a" + struct.pack("<HH", width, height)
+    return _webp_chunk(b"VP8 ", frame + bytes(8))
+
+
+def _vp8l(width: int, height: int, version: int = 0) -> bytes:
+    bits = (width - 1) | ((height - 1) << 14) | (version << 29)
+    return _webp_chunk(b"VP8L", b"\x2f" + struct.pack("<I", bits) + bytes(8))
+
+
+def _vp8x(width: int, height: int, flags: int = 0x10) -> bytes:
+    canvas = (width - 1).to_bytes(3, "little") + (height - 1).to_bytes(3, "little")
+    return _webp_chunk(b"VP8X", bytes([flags]) + bytes(3) + canvas)
+
+
+def _bmp(
+    width: int,
+    height: int,
+    header_size: int = 40,
+    bits: int = 24,
+    compression: int = 0,
+) -> bytes:
+    if header_size == 12:
+        dib = struct.pack("<IHHHH", 12, width, height, 1, bits)
+    else:
+        dib = struct.pack("<IiiHHI", header_size, width, height, 1, bits, compression)
+        dib += bytes(max(0, header_size - len(dib)))
+    return b"BM" + struct.pack("<IHHI", 14 + len(dib), 0, 0, 14 + len(dib)) + dib
+
+
+class TestPng:
+    def test_reads_dimensions(self):
+        assert sniff(_png(640, 480)) == ("PNG", 640, 480)
+
+    def test_palette_image(self):
+        assert sniff(_png(16, 16, bit_depth=4, color_type=3)) == ("PNG", 16, 16)
+
+    def test_truncated_ihdr(self):
+        assert sniff(_png(640, 480)[:24]) is None
+
+    def test_bad_ihdr_crc(self):
+        data = bytearray(_png(640, 480))
+        data[29] ^= 0xFF
+        assert sniff(bytes(data)) is None
+
+    def test_invalid_bit_depth(self):
+        assert sniff(_png(640, 480, bit_depth=3)) is None
+
+    def test_missing_idat(self):
+        data = _png(640, 480)
+        assert sniff(data[: data.index(b"IDAT") - 4]) is None
+
+    def test_zero_dimensions(self):
+        assert sniff(_png(0, 480)) is None
+
+    def test_corrupted_palette(self):
+        data = bytearray(_png(16, 16, bit_depth=4, color_type=3))
+        data[data.index(b"PLTE") + 6] ^= 0xFF
+        assert sniff(bytes(data)) is None
+
+    @pytest.mark.parametrize("palette_length", [0, 16, 3 * 257])
+    def test_bad_palette_length(self, palette_length):
+        data = _png(16, 16, bit_depth=8, color_type=3, palette=bytes(palette_length))
+        assert sniff(data) is None
+
+    def test_palette_image_without_palette(self):
+        data = _png(16, 16, bit_depth=4, color_type=3)
+        plte_start = data.index(b"PLTE") - 4
+        assert sniff(data[:plte_start] + data[plte_start + 12 + 48 :]) is None
+
+    def test_corrupted_ancillary_chunk(self):
+        data = bytearray(_png(640, 480))
+        data[data.index(b"tEXt") + 6] ^= 0xFF
+        assert sniff(bytes(data)) is None
+
+    def test_invalid_chunk_type(self):
+        data = _png(640, 480).replace(b"tEXt", b"t3Xt")
+        assert sniff(data) is None
+
+    def test_oversized_dimensions_are_reported_as_is(self):
+        # The pixel limit is enforced by the validator, not the sniffer
+        assert sniff(_png(30000, 30000)) == ("PNG", 30000, 30000)
+
+
+class TestJpeg:
+    def test_baseline(self):
+        assert sniff(_jpeg(1024, 768)) == ("JPEG", 1024, 768)
+
+    def test_progressive(self):
+        assert sniff(_jpeg(1024, 768, sof_marker=0xC2)) == ("JPEG", 1024, 768)
+
+    def test_grayscale(self):
+        assert sniff(_jpeg(32, 16, components=1)) == ("JPEG", 32, 16)
+
+    def test_sof_without_scan(self):
+        assert sniff(_jpeg(1024, 768, with_sos=False)) is None
+
+    def test_only_sof_segment(self):
+        sof = _jpeg_segment(0xC0, struct.pack(">BHHB", 8, 768, 1024, 1) + b"\x01\x11\x00")
+        assert sniff(b"\xff\xd8" + sof) is None
+
+    def test_twelve_bit_precision(self):
+        assert sniff(_jpeg(1024, 768, precision=12)) is None
+
+    def test_unsupported_component_count(self):
+        assert sniff(_jpeg(1024, 768, components=2)) is None
+
+    def test_truncated(self):
+        data = _jpeg(1024, 768)
+        assert sniff(data[: data.index(b"\xff\xc0") + 6]) is None
+
+    @pytest.mark.parametrize("marker", [0xBE, 0x5A, 0x01, 0xD0, 0xF0, 0xDC])
+    def test_unexpected_marker_before_scan(self, marker):
+        data = _jpeg(1024, 768)
+        assert sniff(data[:2] + _jpeg_segment(marker, bytes(4)) + data[2:]) is None
+
+    def test_bad_quantization_table_length(self):
+        data = _jpeg(1024, 768).replace(
+            _jpeg_segment(0xDB, b"\x00" + bytes(64)), _jpeg_segment(0xDB, b"\x00" + bytes(60))
+        )
+        assert sniff(data) is None
+
+    def test_huffman_table(self):
+        dht = _jpeg_segment(0xC4, b"\x00" + bytes([0, 1] + [0] * 14) + b"\x00")
+        data = _jpeg(1024, 768)
+        assert sniff(data[:2] + dht + data[2:]) == ("JPEG", 1024, 768)
+
+    def test_bad_huffman_table_counts(self):
+        dht = _jpeg_segment(0xC4, b"\x00" + bytes([0, 5] + [0] * 14) + b"\x00")
+        data = _jpeg(1024, 768)
+        assert sniff(data[:2] + dht + data[2:]) is None
+
+    def test_short_jfif_segment(self):
+        data = _jpeg(1024, 768)
+        app0 = _jpeg_segment(0xE0, b"JFIF\x00\x01\x01")
+        assert sniff(data[:2] + app0 + data[2:]) is None
+
+
+class TestWebp:
+    def test_lossy(self):
+        assert sniff(_webp(_vp8(320, 200))) == ("WEBP", 320, 200)
+
+    def test_lossless(self):
+        assert sniff(_webp(_vp8l(320, 200))) == ("WEBP", 320, 200)
+
+    def test_extended(self):
+        data = _webp(_vp8x(320, 200), _webp_chunk(b"ICCP", b"profile"), _vp8(320, 200))
+        assert sniff(data) == ("WEBP", 320, 200)
+
+    def test_extended_without_image(self):
+        assert sniff(_webp(_vp8x(320, 200))) is None
+
+    def test_extended_canvas_mismatch(self):
+        assert sniff(_webp(_vp8x(320, 200), _vp8l(320, 201))) is None
+
+    def test_animated(self):
+        data = _webp(_vp8x(320, 200, flags=0x02), _webp_chunk(b"ANIM", bytes(6)))
+        assert sniff(data) is None
+
+    def test_shorter_than_riff_size(self):
+        assert sniff(_webp(_vp8l(320, 200))[:-4]) is None
+
+    def test_chunk_larger_than_riff(self):
+        data = bytearray(_webp(_vp8l(320, 200)))
+        struct.pack_into("<I", data, 16, 64)
+        assert sniff(bytes(data)) is None
+
+    def test_truncated_lossy_payload(self):
+        data = _webp(_webp_chunk(b"VP8 ", _vp8(320, 200)[8:16]))
+        assert sniff(data) is None
+
+    @pytest.mark.parametrize(
+        "frame_tag",
+        [
+            (1 << 4) | (4 << 5) | 1,  # interframe
+            (1 << 4) | (4 << 5) | (5 << 1),  # unknown version
+            4 << 5,  # not shown
+            (1 << 4) | (100 << 5),  # partition larger than the chunk
+        ],
+    )
+    def test_bad_lossy_frame_tag(self, frame_tag):
+        assert sniff(_webp(_vp8(320, 200, frame_tag=frame_tag))) is None
+
+    def test_bad_lossy_start_code(self):
+        data = _webp(_vp8(320, 200)).replace(b"\x9d\x01\x2a", b"\x9d\x01\x2b")
+        assert sniff(data) is None
+
+    def test_lossless_version(self):
+        assert sniff(_webp(_vp8l(320, 200, version=1))) is None
+
+    def test_header_of_larger_file(self):
+        data = _webp(_vp8l(320, 200))
+        assert sniff(data[:30], file_size=len(data)) == ("WEBP", 320, 200)
+
+
+class TestBmp:
+    def test_info_header(self):
+        assert sniff(_bmp(800, 600)) == ("BMP", 800, 600)
+
+    def test_core_header(self):
+        assert sniff(_bmp(800, 600, header_size=12)) == ("BMP", 800, 600)
+
+    def test_v5_header_top_down(self):
+        assert sniff(_bmp(800, -600, header_size=124)) == ("BMP", 800, 600)
+
+    def test_zero_bits_per_pixel(self):
+        assert sniff(_bmp(800, 600, bits=0)) is None
+
+    @pytest.mark.parametrize("header_size", [16, 41, 200])
+    def test_unknown_header_size(self, header_size):
+        assert sniff(_bmp(800, 600, header_size=header_size)) is None
+
+    def test_compressed(self):
+        assert sniff(_bmp(800, 600, bits=8, compression=1)) is None
+
+    def test_truncated(self):
+        assert sniff(_bmp(800, 600)[:20]) is None
+
+
+@pytest.mark.parametrize("data", [b"", b"GIF89a" + bytes(32), b"\x89PNG", b"\xff\xd8\xff"])
+def test_unrecognized_or_truncated(data):
+    assert sniff(data) is None
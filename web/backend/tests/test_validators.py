@@ -0,0 +1,49 @@
+"""Tests for file validation"""
+
+import struct
+import zlib
+
+import pytest
+
+from src.core.exceptions import ValidationError
+from src.utils.validators import FileValidator
+
+
+def _png_chunk(chunk_type: bytes, payload: bytes) -> bytes:
+    crc = zlib.crc32(chunk_type + payload)
+    return struct.pack(">I", len(payload)) + chunk_type + payload + struct.pack(">I", crc)
+
+
+def _png(width: int, height: int) -> bytes:
+    ihdr = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + _png_chunk(b"IHDR", ihdr)
+        + _png_chunk(b"IDAT", zlib.compress(b"\x00" * 16))
+        + _png_chunk(b"IEND", b"")
+    )
+
+
+def test_validate_image_format_uses_sniffed_header(tmp_path):
+    path = tmp_path / "image.png"
+    path.write_bytes(_png(640, 480))
+
+    metadata = FileValidator().validate_image_format(str(path))
+
+    assert metadata == {"format": "PNG", "width": 640, "height": 480, "mode": None}
+
+
+def test_validate_image_format_rejects_decompression_bomb(tmp_path):
+    path = tmp_path / "bomb.png"
+    path.write_bytes(_png(30000, 30000))
+
+    with pytest.raises(ValidationError):
+        FileValidator().validate_image_format(str(path))
+
+
+def test_validate_image_format_rejects_malformed_header(tmp_path):
+    path = tmp_path / "broken.bmp"
+    path.write_bytes(b"BM" + bytes(12) + struct.pack("<I", 200) + bytes(32))
+
+    with pytest.raises(ValidationError):
+        FileValidator().validate_image_format(str(path))